@@ -1,8 +1,15 @@
-from socket import inet_aton, inet_ntoa
-from typing import NamedTuple
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+from socket import inet_aton
+import sys
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
 
 from async_service import ManagerAPI, as_service
 from eth_utils import get_extended_debug_logger
+from eth_utils.toolz import partition_all
 import trio
 from trio.abc import ReceiveChannel, SendChannel
 from trio.socket import SocketType
@@ -55,7 +62,7 @@ async def DatagramReceiver(
 
 
 async def send_datagram(sock: SocketType, datagram: bytes, endpoint: Endpoint) -> None:
-    await sock.sendto(datagram, (inet_ntoa(endpoint.ip_address), endpoint.port))
+    await sock.sendto(datagram, endpoint.addr)
 
 
 @as_service
@@ -71,3 +78,218 @@ async def DatagramSender(
         async for datagram, endpoint in outbound_datagram_receive_channel:
             await send_datagram(sock, datagram, endpoint)
             logger.debug2("Sending %d bytes to %s", len(datagram), endpoint)
+
+
+#
+# Batched UDP
+#
+# Maximum number of datagrams handed to a single `sendmmsg` call.
+SENDMMSG_MAX_BATCH_SIZE = 64
+
+# Maximum number of datagrams read by a single `recvmmsg` call.  This is the
+# receive burst size used by msquic.
+RECVMMSG_MAX_BATCH_SIZE = 43
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_uint8 * 4),
+        ("sin_zero", ctypes.c_char * 8),
+    ]
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_libc_function(
+    name: str, argtypes: Tuple[object, ...]
+) -> Optional[Callable[..., int]]:
+    if not sys.platform.startswith("linux"):
+        return None
+
+    libc_path = ctypes.util.find_library("c")
+    if libc_path is None:
+        return None
+
+    libc = ctypes.CDLL(libc_path, use_errno=True)
+    try:
+        function = getattr(libc, name)
+    except AttributeError:
+        return None
+
+    function.argtypes = argtypes
+    function.restype = ctypes.c_int
+    return function  # type: ignore
+
+
+_sendmmsg = _load_libc_function(
+    "sendmmsg", (ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int)
+)
+_recvmmsg = _load_libc_function(
+    "recvmmsg",
+    (ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p),
+)
+
+
+async def _sendmmsg_batch(
+    sock: SocketType, datagrams: Sequence[OutboundDatagram]
+) -> None:
+    num_datagrams = len(datagrams)
+
+    addresses = (_SockAddrIn * num_datagrams)()
+    iovecs = (_IOVec * num_datagrams)()
+    messages = (_MMsgHdr * num_datagrams)()
+
+    for index, (datagram, endpoint) in enumerate(datagrams):
+        address = addresses[index]
+        address.sin_family = socket.AF_INET
+        address.sin_port = socket.htons(endpoint.port)
+        address.sin_addr[:] = endpoint.ip_address
+
+        iovecs[index].iov_base = ctypes.cast(ctypes.c_char_p(datagram), ctypes.c_void_p)
+        iovecs[index].iov_len = len(datagram)
+
+        message_header = messages[index].msg_hdr
+        message_header.msg_name = ctypes.addressof(address)
+        message_header.msg_namelen = ctypes.sizeof(_SockAddrIn)
+        message_header.msg_iov = ctypes.pointer(iovecs[index])
+        message_header.msg_iovlen = 1
+
+    fd = sock.fileno()
+    base_address = ctypes.addressof(messages)
+    message_size = ctypes.sizeof(_MMsgHdr)
+
+    num_sent = 0
+    while num_sent < num_datagrams:
+        result = _sendmmsg(  # type: ignore
+            fd,
+            base_address + num_sent * message_size,
+            num_datagrams - num_sent,
+            socket.MSG_DONTWAIT,
+        )
+        if result < 0:
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK):
+                await trio.lowlevel.wait_writable(fd)
+                continue
+            raise OSError(error, os.strerror(error))
+        num_sent += result
+
+    await trio.lowlevel.checkpoint()
+
+
+async def send_datagrams(
+    sock: SocketType, datagrams: Sequence[OutboundDatagram]
+) -> None:
+    """
+    Send a burst of datagrams, using a single `sendmmsg` syscall per
+    ``SENDMMSG_MAX_BATCH_SIZE`` datagrams where the platform supports it.
+    """
+    if _sendmmsg is None or len(datagrams) == 1:
+        for datagram, endpoint in datagrams:
+            await send_datagram(sock, datagram, endpoint)
+    else:
+        for batch in partition_all(SENDMMSG_MAX_BATCH_SIZE, datagrams):
+            await _sendmmsg_batch(sock, batch)
+
+
+class DatagramBatchReceiver:
+    """
+    Receive bursts of datagrams from a socket, using a single `recvmmsg`
+    syscall for up to ``batch_size`` datagrams where the platform supports
+    it.
+
+    Datagrams are received into buffers which are reused across calls to
+    :meth:`receive`, so the returned views are only valid until the next call.
+    """
+
+    def __init__(
+        self, sock: SocketType, batch_size: int = RECVMMSG_MAX_BATCH_SIZE
+    ) -> None:
+        self._sock = sock
+        if _recvmmsg is None:
+            batch_size = 1
+        self._batch_size = batch_size
+
+        self._buffer = bytearray(batch_size * DISCOVERY_DATAGRAM_BUFFER_SIZE)
+        self._buffer_view = memoryview(self._buffer)
+
+        self._addresses = (_SockAddrIn * batch_size)()
+        self._iovecs = (_IOVec * batch_size)()
+        self._messages = (_MMsgHdr * batch_size)()
+
+        self._buffer_array = (ctypes.c_char * len(self._buffer)).from_buffer(
+            self._buffer
+        )
+        buffer_address = ctypes.addressof(self._buffer_array)
+        for index in range(batch_size):
+            self._iovecs[index].iov_base = (
+                buffer_address + index * DISCOVERY_DATAGRAM_BUFFER_SIZE
+            )
+            self._iovecs[index].iov_len = DISCOVERY_DATAGRAM_BUFFER_SIZE
+
+            message_header = self._messages[index].msg_hdr
+            message_header.msg_name = ctypes.addressof(self._addresses[index])
+            message_header.msg_iov = ctypes.pointer(self._iovecs[index])
+            message_header.msg_iovlen = 1
+
+    async def receive(self) -> Tuple[Tuple[memoryview, Endpoint], ...]:
+        if _recvmmsg is None:
+            num_bytes, (ip_address, port) = await self._sock.recvfrom_into(
+                self._buffer, DISCOVERY_DATAGRAM_BUFFER_SIZE
+            )
+            endpoint = Endpoint(inet_aton(ip_address), port)
+            return ((self._buffer_view[:num_bytes], endpoint),)
+
+        fd = self._sock.fileno()
+        while True:
+            # The kernel overwrites the address length with the size of the
+            # address it wrote so it has to be reset before every call.
+            for message in self._messages:
+                message.msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+
+            num_received = _recvmmsg(
+                fd,
+                ctypes.addressof(self._messages),
+                self._batch_size,
+                socket.MSG_DONTWAIT,
+                None,
+            )
+            if num_received >= 0:
+                break
+
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK):
+                await trio.lowlevel.wait_readable(fd)
+                continue
+            raise OSError(error, os.strerror(error))
+
+        await trio.lowlevel.checkpoint()
+
+        datagrams = []
+        for index in range(num_received):
+            start = index * DISCOVERY_DATAGRAM_BUFFER_SIZE
+            end = start + self._messages[index].msg_len
+            address = self._addresses[index]
+            endpoint = Endpoint(bytes(address.sin_addr), socket.ntohs(address.sin_port))
+            datagrams.append((self._buffer_view[start:end], endpoint))
+        return tuple(datagrams)
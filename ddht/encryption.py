@@ -3,7 +3,7 @@ from typing import Iterator
 
 from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers import Cipher, CipherContext
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.ciphers.algorithms import AES
 from cryptography.hazmat.primitives.ciphers.modes import CTR
@@ -55,6 +55,32 @@ def aesctr_encrypt(key: AES128Key, iv: bytes, plain_text: bytes) -> bytes:
     return encryptor.update(plain_text) + encryptor.finalize()
 
 
+def aesctr_encryptor(key: AES128Key, iv: bytes) -> CipherContext:
+    """
+    Return a stateful AES-CTR encryptor.
+
+    Successive calls to ``update`` continue the key stream which allows
+    encrypting a plain text in pieces without first joining them together.
+    """
+    cipher = Cipher(AES(key), CTR(iv), backend=default_backend())
+    return cipher.encryptor()
+
+
+def aesctr_decryptor(key: AES128Key, iv: bytes) -> CipherContext:
+    """
+    Return a stateful AES-CTR decryptor.
+
+    Successive calls to ``update`` continue the key stream which allows
+    decrypting a prefix of the cipher text without touching the rest of it.
+    """
+    try:
+        cipher = Cipher(AES(key), CTR(iv), backend=default_backend())
+    except ValueError as err:
+        raise DecryptionError(str(err)) from err
+
+    return cipher.decryptor()
+
+
 def aesctr_decrypt_stream(
     key: AES128Key, iv: bytes, cipher_text: bytes
 ) -> Iterator[int]:
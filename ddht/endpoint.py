@@ -1,5 +1,6 @@
+import functools
 from socket import inet_ntoa
-from typing import NamedTuple
+from typing import NamedTuple, Tuple
 
 from eth_enr import ENRAPI
 from eth_enr.constants import IP_V4_ADDRESS_ENR_KEY, UDP_PORT_ENR_KEY
@@ -7,12 +8,39 @@ from eth_enr.constants import IP_V4_ADDRESS_ENR_KEY, UDP_PORT_ENR_KEY
 from ddht.exceptions import MissingEndpointFields
 
 
+@functools.lru_cache(maxsize=1024)
+def _ip_address_to_str(ip_address: bytes) -> str:
+    return inet_ntoa(ip_address)
+
+
+@functools.lru_cache(maxsize=1024)
+def _to_socket_address(ip_address: bytes, port: int) -> Tuple[str, int]:
+    return (_ip_address_to_str(ip_address), port)
+
+
 class Endpoint(NamedTuple):
     ip_address: bytes
     port: int
 
     def __str__(self) -> str:
-        return f"{inet_ntoa(self.ip_address)}:{self.port}"
+        return f"{self.ip_str}:{self.port}"
+
+    @property
+    def ip_str(self) -> str:
+        """
+        The dotted string form of the ``ip_address``.
+
+        The conversion is cached per address since the same few endpoints
+        are converted over and over.
+        """
+        return _ip_address_to_str(self.ip_address)
+
+    @property
+    def addr(self) -> Tuple[str, int]:
+        """
+        The ``(host, port)`` address tuple for use with the socket APIs.
+        """
+        return _to_socket_address(self.ip_address, self.port)
 
     @classmethod
     def from_enr(self, enr: ENRAPI) -> "Endpoint":
@@ -1,30 +1,47 @@
-from typing import Iterable, Sequence, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
 from eth_enr import ENRAPI
 from eth_enr.constants import MAX_ENR_SIZE
 from eth_enr.sedes import ENRSedes
 import rlp
-from rlp.sedes import CountableList
+from rlp.codec import length_prefix
+
+
+def _get_encoded_size(enr: ENRAPI) -> int:
+    """
+    Return the length of the RLP encoding of ``enr``.
+
+    ENRs are immutable so the length is memoized on the record itself, which
+    means records that are sent out repeatedly are only ever encoded once.
+    """
+    try:
+        return enr._encoded_size  # type: ignore
+    except AttributeError:
+        encoded_size = len(rlp.encode(enr, ENRSedes))
+        try:
+            enr._encoded_size = encoded_size  # type: ignore
+        except AttributeError:
+            pass
+        return encoded_size
 
 
 def _partition_enrs(
     enrs: Sequence[ENRAPI], max_payload_size: int
 ) -> Iterable[Tuple[ENRAPI, ...]]:
-    num_records = len(enrs)
-    min_records = max_payload_size // MAX_ENR_SIZE
-    left = 0
-    right = min_records
-
-    while right < num_records:
-        encoded = rlp.encode(enrs[left : right + 1], CountableList(ENRSedes))
-        if len(encoded) > max_payload_size:
-            yield tuple(enrs[left:right])
-            left, right = right, right + min_records
-            continue
-        else:
-            right += 1
-
-    yield tuple(enrs[left:right])
+    batch: List[ENRAPI] = []
+    batch_size = 0
+
+    for enr in enrs:
+        size = batch_size + _get_encoded_size(enr)
+        encoded_size = len(length_prefix(size, 0xC0)) + size
+        if batch and encoded_size > max_payload_size:
+            yield tuple(batch)
+            batch = []
+            size -= batch_size
+        batch.append(enr)
+        batch_size = size
+
+    yield tuple(batch)
 
 
 def partition_enrs(
@@ -1,6 +1,7 @@
+from contextlib import asynccontextmanager
+import functools
 from typing import AsyncIterator, Collection, Optional
 
-from async_generator import asynccontextmanager
 from async_service import background_trio_service
 from eth_enr import ENRAPI, QueryableENRDatabaseAPI
 from eth_enr.constants import IP_V4_ADDRESS_ENR_KEY, UDP_PORT_ENR_KEY
@@ -45,6 +46,10 @@ class Node(NodeAPI):
         self._lock = NamedLock()
 
     def __str__(self) -> str:
+        return self._label
+
+    @functools.cached_property
+    def _label(self) -> str:
         return f"{humanize_hash(self.node_id)}@{self.endpoint}"  # type: ignore
 
     @property
@@ -46,11 +46,13 @@ async def PacketDecoder(
             try:
                 packet = decode_packet(datagram)
                 logger.debug(
-                    f"Successfully decoded {packet.__class__.__name__} from {endpoint}"
+                    "Successfully decoded %s from %s",
+                    packet.__class__.__name__,
+                    endpoint,
                 )
             except ValidationError:
                 logger.debug(
-                    f"Failed to decode a packet from {endpoint}", exc_info=True
+                    "Failed to decode a packet from %s", endpoint, exc_info=True
                 )
             else:
                 await inbound_packet_send_channel.send(InboundPacket(packet, endpoint))
@@ -68,5 +70,5 @@ async def PacketEncoder(
     async with outbound_packet_receive_channel, outbound_datagram_send_channel:
         async for packet, endpoint in outbound_packet_receive_channel:
             outbound_datagram = OutboundDatagram(packet.to_wire_bytes(), endpoint)
-            logger.debug(f"Encoded {packet.__class__.__name__} for {endpoint}")
+            logger.debug("Encoded %s for %s", packet.__class__.__name__, endpoint)
             await outbound_datagram_send_channel.send(outbound_datagram)
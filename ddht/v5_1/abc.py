@@ -220,9 +220,25 @@ class PoolAPI(ABC, Container[uuid.UUID]):
         ...
 
 
+class RequestSubscriptionAPI(trio.abc.ReceiveChannel[InboundMessage[TBaseMessage]]):
+    @abstractmethod
+    async def receive_many(
+        self, count: int
+    ) -> Tuple[InboundMessage[TBaseMessage], ...]:
+        """
+        Wait until ``count`` responses have been received and return all of
+        them at once.
+        """
+        ...
+
+
 class DispatcherAPI(ServiceAPI):
     subscription_manager: SubscriptionManagerAPI[BaseMessage]
 
+    @abstractmethod
+    async def handle_inbound_envelope(self, envelope: InboundEnvelope) -> None:
+        ...
+
     @abstractmethod
     async def send_message(self, message: AnyOutboundMessage) -> None:
         ...
@@ -239,7 +255,7 @@ class DispatcherAPI(ServiceAPI):
     @abstractmethod
     def subscribe_request(
         self, request: AnyOutboundMessage, response_message_type: Type[TBaseMessage],
-    ) -> AsyncContextManager[trio.abc.ReceiveChannel[InboundMessage[TBaseMessage]]]:
+    ) -> AsyncContextManager[RequestSubscriptionAPI[TBaseMessage]]:
         ...
 
 
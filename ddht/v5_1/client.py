@@ -1,10 +1,9 @@
 import logging
-import socket
 from typing import (
+    Any,
     AsyncContextManager,
     AsyncIterator,
     Collection,
-    List,
     Optional,
     Sequence,
     Tuple,
@@ -18,27 +17,24 @@ from eth_keys import keys
 from eth_typing import NodeID
 from eth_utils import ValidationError
 import trio
+from trio.socket import SocketType
 
 from ddht.base_message import AnyInboundMessage, AnyOutboundMessage, InboundMessage
 from ddht.datagram import (
-    DatagramReceiver,
-    DatagramSender,
-    InboundDatagram,
+    SENDMMSG_MAX_BATCH_SIZE,
+    DatagramBatchReceiver,
     OutboundDatagram,
+    send_datagrams,
 )
 from ddht.endpoint import Endpoint
 from ddht.enr import partition_enrs
+from ddht.exceptions import DecodingError, DecryptionError
 from ddht.message_registry import MessageTypeRegistry
 from ddht.request_tracker import RequestTracker
 from ddht.v5_1.abc import ClientAPI, EventsAPI
 from ddht.v5_1.constants import FOUND_NODES_MAX_PAYLOAD_SIZE, REQUEST_RESPONSE_TIMEOUT
 from ddht.v5_1.dispatcher import Dispatcher
-from ddht.v5_1.envelope import (
-    EnvelopeDecoder,
-    EnvelopeEncoder,
-    InboundEnvelope,
-    OutboundEnvelope,
-)
+from ddht.v5_1.envelope import InboundEnvelope, OutboundEnvelope, SpscRing
 from ddht.v5_1.events import Events
 from ddht.v5_1.messages import (
     BaseMessage,
@@ -54,6 +50,7 @@ from ddht.v5_1.messages import (
     TopicQueryMessage,
     v51_registry,
 )
+from ddht.v5_1.packets import decode_packet
 from ddht.v5_1.pool import Pool
 from ddht.validation import validate_found_nodes_distances
 
@@ -69,6 +66,7 @@ class Client(Service, ClientAPI):
         session_cache_size: int,
         events: EventsAPI = None,
         message_type_registry: MessageTypeRegistry = v51_registry,
+        rx_queue_depth: int = 1024,
     ) -> None:
         self.local_private_key = local_private_key
 
@@ -76,40 +74,43 @@ class Client(Service, ClientAPI):
         self._listening = trio.Event()
 
         self.enr_manager = ENRManager(private_key=local_private_key, enr_db=enr_db,)
+        # The node id is derived from the private key so it never changes,
+        # unlike the rest of the local ENR.
+        self._local_node_id = self.enr_manager.enr.node_id
         self.enr_db = enr_db
         self._registry = message_type_registry
 
         self.request_tracker = RequestTracker()
 
-        # Datagrams
-        (
-            self._outbound_datagram_send_channel,
-            self._outbound_datagram_receive_channel,
-        ) = trio.open_memory_channel[OutboundDatagram](256)
-        (
-            self._inbound_datagram_send_channel,
-            self._inbound_datagram_receive_channel,
-        ) = trio.open_memory_channel[InboundDatagram](256)
-
-        # EnvelopePair
+        # Envelopes
+        #
+        # Inbound datagrams are decoded directly in the socket receive loop
+        # and handed to the dispatcher through a single-producer ring, and
+        # outbound envelopes are encoded directly in the socket send loop, so
+        # the only envelope channel needed is the one which fans in packets
+        # from the sessions.
+        #
+        # The ingress ring is sized to roughly the number of maximum sized
+        # datagrams in flight on the link (bandwidth-delay product divided by
+        # the datagram size) so that bursts are absorbed rather than dropped.
+        # The message level channels further down the pipeline are kept
+        # small so that a slow dispatcher applies backpressure to the
+        # producers early instead of queueing up latency.
+        self._inbound_envelope_ring = SpscRing[InboundEnvelope](rx_queue_depth)
         (
             self._outbound_envelope_send_channel,
             self._outbound_envelope_receive_channel,
         ) = trio.open_memory_channel[OutboundEnvelope](256)
-        (
-            self._inbound_envelope_send_channel,
-            self._inbound_envelope_receive_channel,
-        ) = trio.open_memory_channel[InboundEnvelope](256)
 
         # Messages
         (
             self._outbound_message_send_channel,
             self._outbound_message_receive_channel,
-        ) = trio.open_memory_channel[AnyOutboundMessage](256)
+        ) = trio.open_memory_channel[AnyOutboundMessage](128)
         (
             self._inbound_message_send_channel,
             self._inbound_message_receive_channel,
-        ) = trio.open_memory_channel[AnyInboundMessage](256)
+        ) = trio.open_memory_channel[AnyInboundMessage](128)
 
         if events is None:
             events = Events()
@@ -117,7 +118,7 @@ class Client(Service, ClientAPI):
 
         self.pool = Pool(
             local_private_key=self.local_private_key,
-            local_node_id=self.enr_manager.enr.node_id,
+            local_node_id=self._local_node_id,
             enr_db=self.enr_db,
             outbound_envelope_send_channel=self._outbound_envelope_send_channel,
             inbound_message_send_channel=self._inbound_message_send_channel,
@@ -127,51 +128,28 @@ class Client(Service, ClientAPI):
         )
 
         self.dispatcher = Dispatcher(
-            self._inbound_envelope_receive_channel,
+            None,
             self._inbound_message_receive_channel,
             self.pool,
             self.enr_db,
             self.events,
         )
-        self.envelope_decoder = EnvelopeEncoder(
-            self._outbound_envelope_receive_channel,
-            self._outbound_datagram_send_channel,
-        )
-        self.envelope_encoder = EnvelopeDecoder(
-            self._inbound_datagram_receive_channel,
-            self._inbound_envelope_send_channel,
-            self.enr_manager.enr.node_id,
-        )
 
         self._ready = trio.Event()
 
     @property
     def local_node_id(self) -> NodeID:
-        return self.pool.local_node_id
+        return self._local_node_id
 
     async def run(self) -> None:
-        self.manager.run_daemon_task(self._run_envelope_and_dispatcher_services)
+        self.manager.run_daemon_task(self._run_dispatcher_service)
         self.manager.run_daemon_task(self._do_listen, self.listen_on)
 
         await self.manager.wait_finished()
 
-    async def _run_envelope_and_dispatcher_services(self) -> None:
-        """
-        Ensure that in the task hierarchy the envelope encode will be shut down
-        *after* the dispatcher.
-
-        run()
-          |
-          ---EnvelopeEncoder
-                |
-                ---EnvelopeDecoder
-                      |
-                      ---Dispatcher
-        """
-        async with background_trio_service(self.envelope_encoder):
-            async with background_trio_service(self.envelope_decoder):
-                async with background_trio_service(self.dispatcher):
-                    await self.manager.wait_finished()
+    async def _run_dispatcher_service(self) -> None:
+        async with background_trio_service(self.dispatcher):
+            await self.manager.wait_finished()
 
     async def wait_listening(self) -> None:
         await self._listening.wait()
@@ -180,26 +158,104 @@ class Client(Service, ClientAPI):
         sock = trio.socket.socket(
             family=trio.socket.AF_INET, type=trio.socket.SOCK_DGRAM,
         )
-        ip_address, port = listen_on
-        await sock.bind((socket.inet_ntoa(ip_address), port))
+        await sock.bind(listen_on.addr)
 
         self._listening.set()
         await self.events.listening.trigger(listen_on)
 
         self.logger.debug("Network connection listening on %s", listen_on)
 
-        # TODO: the datagram services need to use the `EventsAPI`
-        datagram_sender = DatagramSender(self._outbound_datagram_receive_channel, sock)  # type: ignore  # noqa: E501
-        self.manager.run_daemon_child_service(datagram_sender)
-
-        datagram_receiver = DatagramReceiver(sock, self._inbound_datagram_send_channel)  # type: ignore  # noqa: E501
-        self.manager.run_daemon_child_service(datagram_receiver)
+        # TODO: the datagram handling needs to use the `EventsAPI`
+        self.manager.run_daemon_task(self._handle_outbound_envelopes, sock)
+        self.manager.run_daemon_task(self._handle_inbound_envelopes)
+        self.manager.run_daemon_task(self._handle_inbound_datagrams, sock)
 
         await self.manager.wait_finished()
 
+    async def _handle_outbound_envelopes(self, sock: SocketType) -> None:
+        receive_channel = self._outbound_envelope_receive_channel
+
+        async with receive_channel:
+            async for packet, endpoint in receive_channel:
+                datagrams = [OutboundDatagram(packet.to_wire_bytes(), endpoint)]
+
+                # Pick up anything else that is already queued so that bursts
+                # like multi-message FOUNDNODES responses are sent with a
+                # single syscall.
+                while len(datagrams) < SENDMMSG_MAX_BATCH_SIZE:
+                    try:
+                        packet, endpoint = receive_channel.receive_nowait()
+                    except (trio.WouldBlock, trio.EndOfChannel):
+                        break
+                    datagrams.append(OutboundDatagram(packet.to_wire_bytes(), endpoint))
+
+                await send_datagrams(sock, datagrams)
+
+    async def _handle_inbound_datagrams(self, sock: SocketType) -> None:
+        local_node_id = self.local_node_id
+
+        # Datagrams are fully decoded before the next burst is received and
+        # `decode_packet` copies out everything that outlives the call, so the
+        # receiver's buffers can be reused for every burst.
+        receiver = DatagramBatchReceiver(sock)
+
+        while self.manager.is_running:
+            for datagram, endpoint in await receiver.receive():
+                try:
+                    packet = decode_packet(datagram, local_node_id)
+                except (DecryptionError, DecodingError, ValidationError):
+                    # Avoid hex encoding junk datagrams unless they will be logged
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            "Failed to decode datagram %s from %s",
+                            datagram.hex(),
+                            endpoint,
+                            exc_info=True,
+                        )
+                else:
+                    self._inbound_envelope_ring.push(InboundEnvelope(packet, endpoint))
+
+    async def _handle_inbound_envelopes(self) -> None:
+        while self.manager.is_running:
+            for envelope in await self._inbound_envelope_ring.receive_batch():
+                try:
+                    await self.dispatcher.handle_inbound_envelope(envelope)
+                except trio.BrokenResourceError:
+                    self.logger.debug(
+                        "Client exiting due to `trio.BrokenResourceError`"
+                    )
+                    self.manager.cancel()
+                    return
+
     #
     # Message API
     #
+    async def _send_request(
+        self,
+        node_id: NodeID,
+        endpoint: Endpoint,
+        request_id: Optional[bytes],
+        message_class: Type[BaseMessage],
+        *fields: Any,
+    ) -> bytes:
+        with self.request_tracker.reserve_request_id(
+            node_id, request_id
+        ) as message_request_id:
+            await self.dispatcher.send_message(
+                AnyOutboundMessage(
+                    message_class(message_request_id, *fields), endpoint, node_id
+                )
+            )
+
+        return message_request_id
+
+    async def _send_response(
+        self, node_id: NodeID, endpoint: Endpoint, message: BaseMessage
+    ) -> None:
+        await self.dispatcher.send_message(
+            AnyOutboundMessage(message, endpoint, node_id)
+        )
+
     async def send_ping(
         self,
         node_id: NodeID,
@@ -211,15 +267,9 @@ class Client(Service, ClientAPI):
         if enr_seq is None:
             enr_seq = self.enr_manager.enr.sequence_number
 
-        with self.request_tracker.reserve_request_id(
-            node_id, request_id
-        ) as message_request_id:
-            message = AnyOutboundMessage(
-                PingMessage(message_request_id, enr_seq), endpoint, node_id,
-            )
-            await self.dispatcher.send_message(message)
-
-        return message_request_id
+        return await self._send_request(
+            node_id, endpoint, request_id, PingMessage, enr_seq
+        )
 
     async def send_pong(
         self,
@@ -232,12 +282,11 @@ class Client(Service, ClientAPI):
         if enr_seq is None:
             enr_seq = self.enr_manager.enr.sequence_number
 
-        message = AnyOutboundMessage(
-            PongMessage(request_id, enr_seq, endpoint.ip_address, endpoint.port,),
-            endpoint,
+        await self._send_response(
             node_id,
+            endpoint,
+            PongMessage(request_id, enr_seq, endpoint.ip_address, endpoint.port),
         )
-        await self.dispatcher.send_message(message)
 
     async def send_find_nodes(
         self,
@@ -247,17 +296,9 @@ class Client(Service, ClientAPI):
         distances: Collection[int],
         request_id: Optional[bytes] = None,
     ) -> bytes:
-        with self.request_tracker.reserve_request_id(
-            node_id, request_id
-        ) as message_request_id:
-            message = AnyOutboundMessage(
-                FindNodeMessage(message_request_id, tuple(distances)),
-                endpoint,
-                node_id,
-            )
-            await self.dispatcher.send_message(message)
-
-        return message_request_id
+        return await self._send_request(
+            node_id, endpoint, request_id, FindNodeMessage, tuple(distances)
+        )
 
     async def send_found_nodes(
         self,
@@ -272,10 +313,9 @@ class Client(Service, ClientAPI):
         )
         num_batches = len(enr_batches)
         for batch in enr_batches:
-            message = AnyOutboundMessage(
-                FoundNodesMessage(request_id, num_batches, batch,), endpoint, node_id,
+            await self._send_response(
+                node_id, endpoint, FoundNodesMessage(request_id, num_batches, batch),
             )
-            await self.dispatcher.send_message(message)
 
         return num_batches
 
@@ -288,25 +328,16 @@ class Client(Service, ClientAPI):
         payload: bytes,
         request_id: Optional[bytes] = None,
     ) -> bytes:
-        with self.request_tracker.reserve_request_id(
-            node_id, request_id
-        ) as message_request_id:
-            message = AnyOutboundMessage(
-                TalkRequestMessage(message_request_id, protocol, payload),
-                endpoint,
-                node_id,
-            )
-            await self.dispatcher.send_message(message)
-
-        return message_request_id
+        return await self._send_request(
+            node_id, endpoint, request_id, TalkRequestMessage, protocol, payload
+        )
 
     async def send_talk_response(
         self, node_id: NodeID, endpoint: Endpoint, *, payload: bytes, request_id: bytes,
     ) -> None:
-        message = AnyOutboundMessage(
-            TalkResponseMessage(request_id, payload), endpoint, node_id,
+        await self._send_response(
+            node_id, endpoint, TalkResponseMessage(request_id, payload)
         )
-        await self.dispatcher.send_message(message)
 
     async def send_register_topic(
         self,
@@ -318,17 +349,9 @@ class Client(Service, ClientAPI):
         ticket: bytes = b"",
         request_id: Optional[bytes] = None,
     ) -> bytes:
-        with self.request_tracker.reserve_request_id(
-            node_id, request_id
-        ) as message_request_id:
-            message = AnyOutboundMessage(
-                RegisterTopicMessage(message_request_id, topic, enr, ticket),
-                endpoint,
-                node_id,
-            )
-            await self.dispatcher.send_message(message)
-
-        return message_request_id
+        return await self._send_request(
+            node_id, endpoint, request_id, RegisterTopicMessage, topic, enr, ticket
+        )
 
     async def send_ticket(
         self,
@@ -339,18 +362,16 @@ class Client(Service, ClientAPI):
         wait_time: int,
         request_id: bytes,
     ) -> None:
-        message = AnyOutboundMessage(
-            TicketMessage(request_id, ticket, wait_time), endpoint, node_id,
+        await self._send_response(
+            node_id, endpoint, TicketMessage(request_id, ticket, wait_time)
         )
-        await self.dispatcher.send_message(message)
 
     async def send_registration_confirmation(
         self, node_id: NodeID, endpoint: Endpoint, *, topic: bytes, request_id: bytes,
     ) -> None:
-        message = AnyOutboundMessage(
-            RegistrationConfirmationMessage(request_id, topic), endpoint, node_id,
+        await self._send_response(
+            node_id, endpoint, RegistrationConfirmationMessage(request_id, topic)
         )
-        await self.dispatcher.send_message(message)
 
     async def send_topic_query(
         self,
@@ -360,14 +381,9 @@ class Client(Service, ClientAPI):
         topic: bytes,
         request_id: Optional[bytes] = None,
     ) -> bytes:
-        with self.request_tracker.reserve_request_id(
-            node_id, request_id
-        ) as message_request_id:
-            message = AnyOutboundMessage(
-                TopicQueryMessage(message_request_id, topic), endpoint, node_id,
-            )
-            await self.dispatcher.send_message(message)
-        return message_request_id
+        return await self._send_request(
+            node_id, endpoint, request_id, TopicQueryMessage, topic
+        )
 
     #
     # Request/Response API
@@ -411,10 +427,8 @@ class Client(Service, ClientAPI):
                 if total == 1:
                     responses = (head_response,)
                 elif total > 1:
-                    tail_responses: List[InboundMessage[FoundNodesMessage]] = []
-                    for _ in range(total - 1):
-                        tail_responses.append(await subscription.receive())
-                    responses = (head_response,) + tuple(tail_responses)
+                    tail_responses = await subscription.receive_many(total - 1)
+                    responses = (head_response,) + tail_responses
                 else:
                     raise ValidationError(
                         f"Invalid `total` counter in response: total={total}"
@@ -1,5 +1,16 @@
+import collections
 import functools
-from typing import AsyncContextManager, AsyncIterator, Optional, Set, Tuple, Type
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    DefaultDict,
+    Deque,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 from async_generator import asynccontextmanager
 from async_service import Service
@@ -19,7 +30,13 @@ from ddht.base_message import (
 )
 from ddht.endpoint import Endpoint
 from ddht.subscription_manager import SubscriptionManager
-from ddht.v5_1.abc import DispatcherAPI, EventsAPI, PoolAPI, SessionAPI
+from ddht.v5_1.abc import (
+    DispatcherAPI,
+    EventsAPI,
+    PoolAPI,
+    RequestSubscriptionAPI,
+    SessionAPI,
+)
 from ddht.v5_1.constants import REQUEST_RESPONSE_TIMEOUT, SESSION_IDLE_TIMEOUT
 from ddht.v5_1.envelope import InboundEnvelope
 from ddht.v5_1.events import Events
@@ -39,10 +56,8 @@ from ddht.v5_1.messages import (
 
 
 def _get_event_for_outbound_message(
-    events: EventsAPI, message: OutboundMessage[TBaseMessage],
+    events: EventsAPI, message_type: Type[TBaseMessage],
 ) -> EventAPI[OutboundMessage[TBaseMessage]]:
-    message_type = type(message.message)
-
     if message_type is PingMessage:
         return events.ping_sent
     elif message_type is PongMessage:
@@ -68,10 +83,8 @@ def _get_event_for_outbound_message(
 
 
 def _get_event_for_inbound_message(
-    events: EventsAPI, message: InboundMessage[TBaseMessage]
+    events: EventsAPI, message_type: Type[TBaseMessage],
 ) -> EventAPI[InboundMessage[TBaseMessage]]:
-    message_type = type(message.message)
-
     if message_type is PingMessage:
         return events.ping_received
     elif message_type is PongMessage:
@@ -99,10 +112,15 @@ def _get_event_for_inbound_message(
 class Dispatcher(Service, DispatcherAPI):
     _reserved_request_ids: Set[Tuple[NodeID, bytes]]
     _active_request_ids: Set[Tuple[NodeID, bytes]]
+    _request_subscriptions: DefaultDict[
+        Tuple[NodeID, bytes], Set["_RequestSubscription[Any]"]
+    ]
 
     def __init__(
         self,
-        inbound_envelope_receive_channel: trio.abc.ReceiveChannel[InboundEnvelope],
+        inbound_envelope_receive_channel: Optional[
+            trio.abc.ReceiveChannel[InboundEnvelope]
+        ],
         inbound_message_receive_channel: trio.abc.ReceiveChannel[AnyInboundMessage],
         pool: PoolAPI,
         enr_db: ENRDatabaseAPI,
@@ -130,6 +148,8 @@ class Dispatcher(Service, DispatcherAPI):
         self._reserved_request_ids = set()
         self._active_request_ids = set()
 
+        self._request_subscriptions = collections.defaultdict(set)
+
     def subscribe(
         self,
         message_type: Type[TBaseMessage],
@@ -139,9 +159,12 @@ class Dispatcher(Service, DispatcherAPI):
         return self.subscription_manager.subscribe(message_type, endpoint, node_id)
 
     async def run(self) -> None:
-        self.manager.run_daemon_task(
-            self._handle_inbound_envelopes, self._inbound_envelope_receive_channel,
-        )
+        # When no channel is provided the owner of this dispatcher is
+        # responsible for feeding envelopes in via `handle_inbound_envelope`.
+        if self._inbound_envelope_receive_channel is not None:
+            self.manager.run_daemon_task(
+                self._handle_inbound_envelopes, self._inbound_envelope_receive_channel,
+            )
         self.manager.run_daemon_task(
             self._handle_inbound_messages, self._inbound_message_receive_channel,
         )
@@ -157,47 +180,49 @@ class Dispatcher(Service, DispatcherAPI):
     ) -> None:
         async with receive_channel:
             async for envelope in receive_channel:
-                was_handled = False
-                for session in self._get_sessions_for_inbound_envelope(envelope):
-                    try:
-                        was_handled |= await session.handle_inbound_envelope(envelope)
-                    except trio.BrokenResourceError:
-                        self.logger.debug(
-                            "Dispatcher exiting due to trio.BrokenResourceError"
-                        )
-                        self.manager.cancel()
-                        return
-                    else:
-                        self.logger.debug2(
-                            "inbound envelope %s dispatched to %s", envelope, session,
-                        )
-                if was_handled is False:
-                    if envelope.packet.is_message:
-                        session = self._pool.receive_session(envelope.sender_endpoint)
-                        await session.handle_inbound_envelope(envelope)
-                        self.logger.debug(
-                            "inbound envelope %s initiated new session: %s",
-                            envelope,
-                            session,
-                        )
-                    else:
-                        self.logger.debug(
-                            "discarding unhandled inbound envelope %s", envelope,
-                        )
+                try:
+                    await self.handle_inbound_envelope(envelope)
+                except trio.BrokenResourceError:
+                    self.logger.debug(
+                        "Dispatcher exiting due to trio.BrokenResourceError"
+                    )
+                    self.manager.cancel()
+                    return
+
+    async def handle_inbound_envelope(self, envelope: InboundEnvelope) -> None:
+        was_handled = False
+        for session in self._get_sessions_for_inbound_envelope(envelope):
+            was_handled |= await session.handle_inbound_envelope(envelope)
+            self.logger.debug2(
+                "inbound envelope %s dispatched to %s", envelope, session,
+            )
+        if was_handled is False:
+            if envelope.packet.is_message:
+                session = self._pool.receive_session(envelope.sender_endpoint)
+                await session.handle_inbound_envelope(envelope)
+                self.logger.debug(
+                    "inbound envelope %s initiated new session: %s", envelope, session,
+                )
+            else:
+                self.logger.debug(
+                    "discarding unhandled inbound envelope %s", envelope,
+                )
 
     async def _handle_outbound_messages(
         self, receive_channel: trio.abc.ReceiveChannel[AnyOutboundMessage],
     ) -> None:
+        # Keyed on the message type rather than the message itself, which
+        # would have to be hashed field by field and never hits the cache.
         @functools.lru_cache(16)
         def get_event(
-            message: OutboundMessage[TBaseMessage],
+            message_type: Type[TBaseMessage],
         ) -> EventAPI[OutboundMessage[TBaseMessage]]:
-            return _get_event_for_outbound_message(self._events, message)
+            return _get_event_for_outbound_message(self._events, message_type)
 
         async with receive_channel:
             async for message in receive_channel:
                 # trigger Event
-                event = get_event(message)
+                event = get_event(type(message.message))
                 await event.trigger(message)
 
                 # feed sessions
@@ -220,18 +245,19 @@ class Dispatcher(Service, DispatcherAPI):
     ) -> None:
         @functools.lru_cache(16)
         def get_event(
-            message: InboundMessage[TBaseMessage],
+            message_type: Type[TBaseMessage],
         ) -> EventAPI[InboundMessage[TBaseMessage]]:
-            return _get_event_for_inbound_message(self._events, message)
+            return _get_event_for_inbound_message(self._events, message_type)
 
         async with receive_channel:
             async for message in receive_channel:
                 # trigger Event
-                event = get_event(message)
+                event = get_event(type(message.message))
                 await event.trigger(message)
 
                 # feed subscriptions
                 self.subscription_manager.feed_subscriptions(message)
+                self._feed_request_subscriptions(message)
 
     #
     # Session Management
@@ -386,63 +412,123 @@ class Dispatcher(Service, DispatcherAPI):
     @asynccontextmanager
     async def subscribe_request(
         self, request: AnyOutboundMessage, response_message_type: Type[TBaseMessage],
-    ) -> AsyncIterator[trio.abc.ReceiveChannel[InboundMessage[TBaseMessage]]]:
+    ) -> AsyncIterator[RequestSubscriptionAPI[TBaseMessage]]:
         request_id = request.message.request_id
 
         self.logger.debug2(
             "Sending request: %s with request id %s", request, request_id.hex(),
         )
 
-        send_channel, receive_channel = trio.open_memory_channel[TBaseMessage](256)
+        subscription = _RequestSubscription[TBaseMessage](
+            request,
+            response_message_type,
+            deadline=trio.current_time() + REQUEST_RESPONSE_TIMEOUT,
+        )
+        key = (request.receiver_node_id, request_id)
+        self._request_subscriptions[key].add(subscription)
 
-        async with trio.open_nursery() as nursery:
-            nursery.start_soon(
-                self._manage_request_response,
-                request,
-                response_message_type,
-                send_channel,
-            )
-            async with receive_channel:
+        try:
+            await self.send_message(request)
+            async with subscription:
                 try:
-                    yield receive_channel
+                    yield subscription
                 # Wrap EOC error with TSE to make the timeouts obvious
                 except trio.EndOfChannel as err:
+                    self.logger.debug(
+                        "Abandoned request response monitor: request=%s message_type=%s",
+                        request,
+                        response_message_type,
+                    )
                     raise trio.TooSlowError(
                         f"Timout waiting for response: request_id={request_id.hex()}"
                     ) from err
-            nursery.cancel_scope.cancel()
+        finally:
+            self._request_subscriptions[key].discard(subscription)
+            if not self._request_subscriptions[key]:
+                del self._request_subscriptions[key]
+
+    def _feed_request_subscriptions(self, message: AnyInboundMessage) -> None:
+        key = (message.sender_node_id, message.message.request_id)
+        if key not in self._request_subscriptions:
+            return
+
+        for subscription in self._request_subscriptions[key]:
+            if type(message.message) is not subscription.response_message_type:
+                continue
+            elif message.sender_endpoint != subscription.request.receiver_endpoint:
+                continue
+
+            try:
+                subscription.deliver(message)
+            except trio.WouldBlock:
+                self.logger.debug(
+                    "Discarding response for request %s due to full buffer: %s",
+                    subscription.request,
+                    message,
+                )
+
 
-    async def _manage_request_response(
+class _RequestSubscription(RequestSubscriptionAPI[TBaseMessage]):
+    """
+    Responses for a single request made with `Dispatcher.subscribe_request`.
+
+    Responses are placed directly into a buffer by the dispatcher and the
+    receiver is woken through a single `trio.Event`.  Once the ``deadline``
+    passes, ``receive`` raises `trio.EndOfChannel`.
+    """
+
+    def __init__(
         self,
         request: AnyOutboundMessage,
         response_message_type: Type[TBaseMessage],
-        send_channel: trio.abc.SendChannel[InboundMessage[TBaseMessage]],
+        deadline: float,
+        max_buffer_size: int = 256,
     ) -> None:
-        request_id = request.message.request_id
-
-        with trio.move_on_after(REQUEST_RESPONSE_TIMEOUT) as scope:
-            subscription_ctx = self.subscription_manager.subscribe(
-                response_message_type,
-                request.receiver_endpoint,
-                request.receiver_node_id,
-            )
-            async with subscription_ctx as subscription:
-                self.logger.debug2(
-                    "Sending request with request id %s", request_id.hex(),
-                )
-                # Send the request
-                await self.send_message(request)
-
-                # Wait for the response
-                async with send_channel:
-                    async for response in subscription:
-                        if response.message.request_id != request_id:
-                            continue
-                        else:
-                            await send_channel.send(response)
-        if scope.cancelled_caught:
-            self.logger.debug(
-                "Abandoned request response monitor: request=%s message_type=%s",
-                request,
-                response_message_type,
-            )
+        self.request = request
+        self.response_message_type = response_message_type
+        self.deadline = deadline
+
+        self._max_buffer_size = max_buffer_size
+        self._responses: Deque[InboundMessage[TBaseMessage]] = collections.deque()
+        self._has_responses = trio.Event()
+        self._is_closed = False
+
+    def deliver(self, response: InboundMessage[TBaseMessage]) -> None:
+        if len(self._responses) >= self._max_buffer_size:
+            raise trio.WouldBlock
+        self._responses.append(response)
+        self._has_responses.set()
+
+    async def receive(self) -> InboundMessage[TBaseMessage]:
+        if self._is_closed:
+            raise trio.ClosedResourceError
+
+        with trio.move_on_at(self.deadline):
+            while not self._responses:
+                await self._has_responses.wait()
+                self._has_responses = trio.Event()
+
+        if not self._responses:
+            raise trio.EndOfChannel
+
+        return self._responses.popleft()
+
+    async def receive_many(
+        self, count: int
+    ) -> Tuple[InboundMessage[TBaseMessage], ...]:
+        if self._is_closed:
+            raise trio.ClosedResourceError
+
+        with trio.move_on_at(self.deadline):
+            while len(self._responses) < count:
+                await self._has_responses.wait()
+                self._has_responses = trio.Event()
+
+        if len(self._responses) < count:
+            raise trio.EndOfChannel
+
+        return tuple(self._responses.popleft() for _ in range(count))
+
+    async def aclose(self) -> None:
+        self._is_closed = True
+        await trio.lowlevel.checkpoint()
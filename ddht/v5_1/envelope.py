@@ -1,15 +1,10 @@
-from typing import NamedTuple
+import collections
+from typing import Deque, Generic, NamedTuple, Tuple, TypeVar
 
-from async_service import Service
-from eth_typing import NodeID
-from eth_utils import ValidationError, get_extended_debug_logger
 import trio
-from trio.abc import ReceiveChannel, SendChannel
 
-from ddht.datagram import InboundDatagram, OutboundDatagram
 from ddht.endpoint import Endpoint
-from ddht.exceptions import DecodingError, DecryptionError
-from ddht.v5_1.packets import AnyPacket, decode_packet
+from ddht.v5_1.packets import AnyPacket
 
 
 #
@@ -37,86 +32,42 @@ class OutboundEnvelope(NamedTuple):
         )
 
 
+TItem = TypeVar("TItem")
+
+
 #
-# Envelope encoding/decoding
+# Queues
 #
-class EnvelopeDecoder(Service):
-    """Decodes inbound datagrams to packet objects."""
-
-    def __init__(
-        self,
-        inbound_datagram_receive_channel: ReceiveChannel[InboundDatagram],
-        inbound_envelope_send_channel: SendChannel[InboundEnvelope],
-        local_node_id: NodeID,
-    ) -> None:
-        self.logger = get_extended_debug_logger("ddht.EnvelopeDecoder")
-
-        self._inbound_datagram_receive_channel = inbound_datagram_receive_channel
-        self._inbound_envelope_send_channel = inbound_envelope_send_channel
-        self._local_node_id = local_node_id
-
-    async def run(self) -> None:
-        async with self._inbound_datagram_receive_channel:
-            async with self._inbound_envelope_send_channel:
-                packet: AnyPacket
-                async for datagram, endpoint in self._inbound_datagram_receive_channel:
-                    try:
-                        packet = decode_packet(datagram, self._local_node_id)
-                        self.logger.debug2(
-                            "Successfully decoded %s from %s",
-                            packet.__class__.__name__,
-                            endpoint,
-                        )
-                    except (DecryptionError, DecodingError, ValidationError):
-                        self.logger.debug(
-                            "Failed to decode datagram %s from %s",
-                            datagram.hex(),
-                            endpoint,
-                            exc_info=True,
-                        )
-                    else:
-                        try:
-                            await self._inbound_envelope_send_channel.send(
-                                InboundEnvelope(packet, endpoint)
-                            )
-                        except trio.BrokenResourceError:
-                            self.logger.debug(
-                                "EnvelopeDecoder exiting due to `trio.BrokenResourceError`"
-                            )
-                            self.manager.cancel()
-                            return
-
-
-class EnvelopeEncoder(Service):
-    """Encodes outbound packets to datagrams."""
-
-    def __init__(
-        self,
-        outbound_envelope_receive_channel: ReceiveChannel[OutboundEnvelope],
-        outbound_datagram_send_channel: SendChannel[OutboundDatagram],
-    ) -> None:
-        self.logger = get_extended_debug_logger("ddht.EnvelopeEncoder")
-
-        self._outbound_envelope_receive_channel = outbound_envelope_receive_channel
-        self._outbound_datagram_send_channel = outbound_datagram_send_channel
-
-    async def run(self) -> None:
-        async with self._outbound_envelope_receive_channel:
-            async with self._outbound_datagram_send_channel:
-                async for packet, endpoint in self._outbound_envelope_receive_channel:
-                    outbound_datagram = OutboundDatagram(
-                        packet.to_wire_bytes(), endpoint
-                    )
-                    self.logger.debug2(
-                        "Encoded %s for %s", packet.__class__.__name__, endpoint,
-                    )
-                    try:
-                        await self._outbound_datagram_send_channel.send(
-                            outbound_datagram
-                        )
-                    except trio.BrokenResourceError:
-                        self.logger.debug(
-                            "EnvelopeEncoder exiting due to `trio.BrokenResourceError`"
-                        )
-                        self.manager.cancel()
-                        return
+class SpscRing(Generic[TItem]):
+    """
+    Bounded queue for handing items from a single producer task to a single
+    consumer task.
+
+    Pushing never blocks.  Once ``capacity`` items are buffered the oldest
+    item is dropped, the same way the kernel drops datagrams when a socket
+    buffer is full.  The consumer is woken at most once per batch of pushed
+    items rather than once per item.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._items: Deque[TItem] = collections.deque(maxlen=capacity)
+        self._has_items = trio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, item: TItem) -> None:
+        self._items.append(item)
+        self._has_items.set()
+
+    async def receive_batch(self) -> Tuple[TItem, ...]:
+        """
+        Wait until at least one item is available and then remove and return
+        all of the buffered items.
+        """
+        await self._has_items.wait()
+        self._has_items = trio.Event()
+        items = tuple(self._items)
+        self._items.clear()
+        return items
@@ -1,10 +1,13 @@
-from typing import cast
+import functools
+from typing import Optional, Tuple, Type, cast
 
 from eth_enr.sedes import ENRSedes
 import rlp
+from rlp.codec import length_prefix
 from rlp.sedes import Binary, CountableList, big_endian_int, binary
 
 from ddht.base_message import BaseMessage
+from ddht.constants import UINT8_TO_BYTES
 from ddht.encryption import aesgcm_decrypt
 from ddht.message_registry import MessageTypeRegistry
 from ddht.sedes import ip_address_sedes
@@ -16,6 +19,49 @@ topic_sedes = Binary.fixed_length(32)
 v51_registry = MessageTypeRegistry()
 
 
+#
+# Encoding helpers
+#
+@functools.lru_cache(maxsize=256)
+def _encode_ping_body(enr_seq: int) -> bytes:
+    return cast(bytes, rlp.encode(enr_seq, sedes=big_endian_int))
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_pong_body(enr_seq: int, packet_ip: bytes, packet_port: int) -> bytes:
+    return b"".join(
+        (
+            rlp.encode(enr_seq, sedes=big_endian_int),
+            rlp.encode(packet_ip, sedes=ip_address_sedes),
+            rlp.encode(packet_port, sedes=big_endian_int),
+        )
+    )
+
+
+def _encode_request_id(request_id: bytes) -> bytes:
+    # Request ids are short byte strings so their RLP encoding is either the
+    # single byte itself or a one byte length prefix.
+    if type(request_id) is not bytes or len(request_id) > 55:
+        return cast(bytes, rlp.encode(request_id, sedes=binary))
+    elif len(request_id) == 1 and request_id[0] < 0x80:
+        return request_id
+    else:
+        return UINT8_TO_BYTES[0x80 + len(request_id)] + request_id
+
+
+def _encode_request_id_message(
+    message_type: int, request_id: bytes, body: bytes
+) -> bytes:
+    """
+    Encode a message whose RLP list is the ``request_id`` followed by the
+    already encoded ``body`` fields.
+    """
+    payload = _encode_request_id(request_id) + body
+    return b"".join(
+        (UINT8_TO_BYTES[message_type], length_prefix(len(payload), 0xC0), payload)
+    )
+
+
 #
 # Message types
 #
@@ -25,6 +71,13 @@ class PingMessage(BaseMessage):
 
     fields = (("request_id", binary), ("enr_seq", big_endian_int))
 
+    def to_bytes(self) -> bytes:
+        # The body only changes when our ENR sequence number does so it is
+        # encoded once and reused across requests.
+        return _encode_request_id_message(
+            self.message_type, self.request_id, _encode_ping_body(self.enr_seq)
+        )
+
 
 @v51_registry.register
 class PongMessage(BaseMessage):
@@ -37,6 +90,13 @@ class PongMessage(BaseMessage):
         ("packet_port", big_endian_int),
     )
 
+    def to_bytes(self) -> bytes:
+        return _encode_request_id_message(
+            self.message_type,
+            self.request_id,
+            _encode_pong_body(self.enr_seq, self.packet_ip, self.packet_port),
+        )
+
 
 @v51_registry.register
 class FindNodeMessage(BaseMessage):
@@ -115,6 +175,13 @@ class TopicQueryMessage(BaseMessage):
     fields = (("request_id", binary), ("topic", topic_sedes))
 
 
+# Message classes indexed directly by their `message_type` so that decoding
+# does not need to go through the registry mapping.
+V51_MESSAGE_CLASSES: Tuple[Optional[Type[BaseMessage]], ...] = tuple(
+    v51_registry.get(message_type) for message_type in range(max(v51_registry) + 1)
+)
+
+
 def decode_message(
     decryption_key: AES128Key,
     aes_gcm_nonce: Nonce,
@@ -129,7 +196,15 @@ def decode_message(
         authenticated_data=authenticated_data,
     )
     message_type = message_plain_text[0]
-    message_sedes = message_type_registry[message_type]
+    if message_type_registry is v51_registry:
+        if message_type < len(V51_MESSAGE_CLASSES):
+            message_sedes = V51_MESSAGE_CLASSES[message_type]
+        else:
+            message_sedes = None
+        if message_sedes is None:
+            raise KeyError(message_type)
+    else:
+        message_sedes = message_type_registry[message_type]
     message = rlp.decode(message_plain_text[1:], sedes=message_sedes)
 
     return cast(BaseMessage, message)
@@ -7,12 +7,10 @@ from typing import Generic, NamedTuple, Optional, TypeVar, Union, cast
 from eth_enr.abc import ENRAPI
 from eth_enr.sedes import ENRSedes
 from eth_typing import NodeID
-from eth_utils.toolz import take
 import rlp
 
 from ddht.base_message import BaseMessage, EmptyMessage
-from ddht.constants import UINT8_TO_BYTES
-from ddht.encryption import aesctr_decrypt_stream, aesctr_encrypt, aesgcm_encrypt
+from ddht.encryption import aesctr_decryptor, aesctr_encryptor, aesgcm_encrypt
 from ddht.exceptions import DecodingError
 from ddht.typing import AES128Key, IDNonce, Nonce
 from ddht.v5_1.constants import (
@@ -24,6 +22,11 @@ from ddht.v5_1.constants import (
     WHO_ARE_YOU_PACKET_SIZE,
 )
 
+# Fixed size wire layouts
+HEADER_STRUCT = struct.Struct(">6s2sB12sH")
+WHO_ARE_YOU_STRUCT = struct.Struct(">16sQ")
+HANDSHAKE_HEADER_STRUCT = struct.Struct(">32sBB")
+
 
 @dataclass(frozen=True)
 class MessagePacket:
@@ -51,7 +54,7 @@ class WhoAreYouPacket:
     flag: int = field(init=False, repr=False, default=1)
 
     def to_wire_bytes(self) -> bytes:
-        return b"".join((self.id_nonce, struct.pack(">Q", self.enr_sequence_number),))
+        return WHO_ARE_YOU_STRUCT.pack(self.id_nonce, self.enr_sequence_number)
 
     @classmethod
     def from_wire_bytes(cls, data: bytes) -> "WhoAreYouPacket":
@@ -59,10 +62,8 @@ class WhoAreYouPacket:
             raise DecodingError(
                 f"Invalid length for WhoAreYouPacket: length={len(data)}  data={data.hex()}"
             )
-        stream = BytesIO(data)
-        id_nonce = cast(IDNonce, stream.read(16))
-        enr_sequence_number = int.from_bytes(stream.read(8), "big")
-        return cls(id_nonce, enr_sequence_number)
+        id_nonce, enr_sequence_number = WHO_ARE_YOU_STRUCT.unpack(data)
+        return cls(cast(IDNonce, id_nonce), enr_sequence_number)
 
 
 class HandshakeHeader(NamedTuple):
@@ -71,13 +72,7 @@ class HandshakeHeader(NamedTuple):
     ephemeral_key_size: int  # uint8 (33 for v4)
 
     def to_wire_bytes(self) -> bytes:
-        return b"".join(
-            (
-                self.source_node_id,
-                UINT8_TO_BYTES[self.signature_size],
-                UINT8_TO_BYTES[self.ephemeral_key_size],
-            )
-        )
+        return HANDSHAKE_HEADER_STRUCT.pack(*self)
 
     @classmethod
     def from_wire_bytes(cls, data: bytes) -> "HandshakeHeader":
@@ -85,11 +80,12 @@ class HandshakeHeader(NamedTuple):
             raise DecodingError(
                 f"Invalid length for HandshakeHeader: length={len(data)}  data={data.hex()}"
             )
-        stream = BytesIO(data)
-        source_node_id = NodeID(stream.read(32))
-        signature_size = stream.read(1)[0]
-        ephemeral_key_size = stream.read(1)[0]
-        return cls(source_node_id, signature_size, ephemeral_key_size)
+        (
+            source_node_id,
+            signature_size,
+            ephemeral_key_size,
+        ) = HANDSHAKE_HEADER_STRUCT.unpack(data)
+        return cls(NodeID(source_node_id), signature_size, ephemeral_key_size)
 
 
 @dataclass(frozen=True)
@@ -152,15 +148,7 @@ class Header(NamedTuple):
     auth_data_size: int  # uint16
 
     def to_wire_bytes(self) -> bytes:
-        return b"".join(
-            (
-                self.protocol_id,
-                self.version,
-                UINT8_TO_BYTES[self.flag],
-                self.aes_gcm_nonce,
-                self.auth_data_size.to_bytes(2, "big"),
-            )
-        )
+        return HEADER_STRUCT.pack(*self)
 
     @classmethod
     def from_wire_bytes(cls, data: bytes) -> "Header":
@@ -169,17 +157,18 @@ class Header(NamedTuple):
                 f"Invalid length for Header: actual={len(data)}  "
                 f"expected={HEADER_PACKET_SIZE}  data={data.hex()}"
             )
-        stream = BytesIO(data)
-        protocol_id = stream.read(6)
+        (
+            protocol_id,
+            version,
+            flag,
+            aes_gcm_nonce,
+            auth_data_size,
+        ) = HEADER_STRUCT.unpack(data)
         if protocol_id != PROTOCOL_ID:
             raise DecodingError(f"Invalid protocol: {protocol_id!r}")
-        version = stream.read(2)
         if version != b"\x00\x01":
             raise DecodingError(f"Unsupported version: {version!r}")
-        flag = stream.read(1)[0]
-        aes_gcm_nonce = Nonce(stream.read(12))
-        auth_data_size = int.from_bytes(stream.read(2), "big")
-        return cls(protocol_id, version, flag, aes_gcm_nonce, auth_data_size)
+        return cls(protocol_id, version, flag, Nonce(aes_gcm_nonce), auth_data_size)
 
 
 AuthData = Union[MessagePacket, WhoAreYouPacket, HandshakePacket]
@@ -265,12 +254,18 @@ class Packet(Generic[TAuthData]):
         )
 
     def to_wire_bytes(self) -> bytes:
-        auth_data_bytes = self.auth_data.to_wire_bytes()
-        header_wire_bytes = self.header.to_wire_bytes()
-        header_plaintext = header_wire_bytes + auth_data_bytes
         masking_key = AES128Key(self.dest_node_id[:16])
-        masked_header = aesctr_encrypt(masking_key, self.iv, header_plaintext)
-        return b"".join((self.iv, masked_header, self.message_cipher_text,))
+        # The header and the auth data are masked piecewise with a single
+        # key stream so the datagram is assembled with a single join.
+        encryptor = aesctr_encryptor(masking_key, self.iv)
+        return b"".join(
+            (
+                self.iv,
+                encryptor.update(self.header.to_wire_bytes()),
+                encryptor.update(self.auth_data.to_wire_bytes()),
+                self.message_cipher_text,
+            )
+        )
 
 
 AnyPacket = Union[
@@ -278,16 +273,22 @@ AnyPacket = Union[
 ]
 
 
-def decode_packet(data: bytes, local_node_id: NodeID,) -> AnyPacket:
-    iv = data[:16]
+def decode_packet(data: Union[bytes, memoryview], local_node_id: NodeID,) -> AnyPacket:
+    # Slices of a memoryview do not copy, so only the parts of the datagram
+    # that end up on the returned packet are copied out of it.
+    view = memoryview(data)
+    iv = view[:16].tobytes()
     masking_key = cast(AES128Key, local_node_id[:16])
-    cipher_text_stream = aesctr_decrypt_stream(masking_key, iv, data[16:])
+    # A single stateful decryptor is used for the header and the auth data so
+    # that only the masked portion of the datagram is ever decrypted.
+    decryptor = aesctr_decryptor(masking_key, iv)
 
     # Decode the header
-    header_bytes = bytes(take(HEADER_PACKET_SIZE, cipher_text_stream))
-    header = Header.from_wire_bytes(header_bytes)
+    header_end = 16 + HEADER_PACKET_SIZE
+    header = Header.from_wire_bytes(decryptor.update(view[16:header_end]))
 
-    auth_data_bytes = bytes(take(header.auth_data_size, cipher_text_stream))
+    auth_data_end = header_end + header.auth_data_size
+    auth_data_bytes = decryptor.update(view[header_end:auth_data_end])
     auth_data: Union[MessagePacket, WhoAreYouPacket, HandshakePacket]
     if header.flag == 0:
         auth_data = MessagePacket.from_wire_bytes(auth_data_bytes)
@@ -296,9 +297,9 @@ def decode_packet(data: bytes, local_node_id: NodeID,) -> AnyPacket:
     elif header.flag == 2:
         auth_data = HandshakePacket.from_wire_bytes(auth_data_bytes)
     else:
-        raise DecodingError(f"Unable to decode datagram: {data.hex()}", data)
+        raise DecodingError(f"Unable to decode datagram: {view.hex()}", view.tobytes())
 
-    message_cipher_text = data[16 + HEADER_PACKET_SIZE + header.auth_data_size :]
+    message_cipher_text = view[auth_data_end:].tobytes()
 
     return cast(
         AnyPacket,
@@ -4,7 +4,15 @@ from async_service import background_trio_service
 import pytest
 import trio
 
-from ddht.datagram import DatagramReceiver, DatagramSender, OutboundDatagram
+from ddht.datagram import (
+    RECVMMSG_MAX_BATCH_SIZE,
+    SENDMMSG_MAX_BATCH_SIZE,
+    DatagramBatchReceiver,
+    DatagramReceiver,
+    DatagramSender,
+    OutboundDatagram,
+    send_datagrams,
+)
 from ddht.endpoint import Endpoint
 
 
@@ -49,3 +57,47 @@ async def test_datagram_sender(socket_pair):
             data, sender = await receiving_socket.recvfrom(1024)
         assert data == outbound_datagram.datagram
         assert sender == sender_endpoint
+
+
+@pytest.mark.trio
+async def test_send_datagrams(socket_pair):
+    sending_socket, receiving_socket = socket_pair
+    receiver_endpoint = receiving_socket.getsockname()
+    sender_endpoint = sending_socket.getsockname()
+
+    endpoint = Endpoint(inet_aton(receiver_endpoint[0]), receiver_endpoint[1])
+    outbound_datagrams = tuple(
+        OutboundDatagram(f"packet-{index}".encode(), endpoint)
+        for index in range(SENDMMSG_MAX_BATCH_SIZE + 3)
+    )
+    await send_datagrams(sending_socket, outbound_datagrams)
+
+    with trio.fail_after(0.5):
+        for outbound_datagram in outbound_datagrams:
+            data, sender = await receiving_socket.recvfrom(1024)
+            assert data == outbound_datagram.datagram
+            assert sender == sender_endpoint
+
+
+@pytest.mark.trio
+async def test_datagram_batch_receiver(socket_pair):
+    sending_socket, receiving_socket = socket_pair
+    receiver_address = receiving_socket.getsockname()
+    sender_address = sending_socket.getsockname()
+    sender_endpoint = Endpoint(inet_aton(sender_address[0]), sender_address[1])
+
+    expected = tuple(
+        f"packet-{index}".encode() for index in range(RECVMMSG_MAX_BATCH_SIZE + 3)
+    )
+    for data in expected:
+        await sending_socket.sendto(data, receiver_address)
+
+    receiver = DatagramBatchReceiver(receiving_socket)
+    received = []
+    with trio.fail_after(0.5):
+        while len(received) < len(expected):
+            for datagram, endpoint in await receiver.receive():
+                assert endpoint == sender_endpoint
+                received.append(datagram.tobytes())
+
+    assert tuple(received) == expected
@@ -9,7 +9,7 @@ import pytest
 import trio
 
 from ddht.base_message import AnyOutboundMessage
-from ddht.datagram import OutboundDatagram
+from ddht.datagram import send_datagram
 from ddht.enr import partition_enrs
 from ddht.kademlia import KademliaRoutingTable, compute_log_distance
 from ddht.v5_1.constants import FOUND_NODES_MAX_PAYLOAD_SIZE, REQUEST_RESPONSE_TIMEOUT
@@ -615,9 +615,11 @@ async def test_client_handles_malformed_datagrams(tester, datagram_bytes):
 
         async with alice.client():
             async with alice.events.ping_received.subscribe() as subscription:
-                await bob_client._outbound_datagram_send_channel.send(
-                    OutboundDatagram(datagram_bytes, alice.endpoint)
+                sock = trio.socket.socket(
+                    family=trio.socket.AF_INET, type=trio.socket.SOCK_DGRAM,
                 )
+                with sock:
+                    await send_datagram(sock, datagram_bytes, alice.endpoint)
 
                 # Give the node a minute to crash if it's going to crash
                 for _ in range(100):
@@ -214,3 +214,28 @@ async def test_dispatcher_subscribe_request_response(tester, alice, bob):
 
     assert response.sender_node_id == bob.node_id
     assert response.message.request_id == b"\x12"
+
+
+@pytest.mark.trio
+async def test_dispatcher_subscribe_request_receive_many(tester, alice, bob):
+    driver = tester.session_pair(alice, bob)
+
+    await driver.handshake()
+
+    async with tester.dispatcher_pair(alice, bob) as (alice_dispatcher, _):
+        request = OutboundMessage(
+            PingMessage(b"\x12", alice.enr.sequence_number), bob.endpoint, bob.node_id,
+        )
+        async with alice_dispatcher.subscribe_request(
+            request, PongMessage
+        ) as subscription:
+            await driver.initiator.send_ping(b"\x12")
+            for _ in range(3):
+                await driver.recipient.send_pong(b"\x12")
+
+            with trio.fail_after(1):
+                responses = await subscription.receive_many(3)
+
+    assert len(responses) == 3
+    assert all(response.sender_node_id == bob.node_id for response in responses)
+    assert all(response.message.request_id == b"\x12" for response in responses)
@@ -82,3 +82,28 @@ def test_handshake_packet_encoding(enr):
     result = decode_packet(packet_wire_bytes, dest_node_id)
 
     assert result == packet
+
+
+def test_message_packet_decoding_from_memoryview():
+    initiator_key = b"\x01" * 16
+    aes_gcm_nonce = b"\x02" * 12
+    source_node_id = b"\x03" * 32
+    dest_node_id = b"\x04" * 32
+    message = PingMessage(b"\x01", 0)
+    auth_data = MessagePacket(source_node_id)
+
+    packet = Packet.prepare(
+        aes_gcm_nonce=aes_gcm_nonce,
+        initiator_key=initiator_key,
+        message=message,
+        auth_data=auth_data,
+        dest_node_id=dest_node_id,
+    )
+    buffer = bytearray(packet.to_wire_bytes())
+    result = decode_packet(memoryview(buffer), dest_node_id)
+
+    # overwriting the buffer must not affect the decoded packet
+    buffer[:] = b"\x00" * len(buffer)
+
+    assert result == packet
+    assert type(result.message_cipher_text) is bytes
@@ -0,0 +1,54 @@
+import pytest
+import trio
+
+from ddht.v5_1.envelope import SpscRing
+
+
+@pytest.mark.trio
+async def test_spsc_ring_receives_batches_in_order():
+    ring = SpscRing[int](8)
+
+    ring.push(1)
+    ring.push(2)
+    ring.push(3)
+    assert len(ring) == 3
+
+    with trio.fail_after(1):
+        batch = await ring.receive_batch()
+    assert batch == (1, 2, 3)
+    assert len(ring) == 0
+
+
+@pytest.mark.trio
+async def test_spsc_ring_drops_oldest_when_full():
+    ring = SpscRing[int](2)
+
+    ring.push(1)
+    ring.push(2)
+    ring.push(3)
+
+    with trio.fail_after(1):
+        batch = await ring.receive_batch()
+    assert batch == (2, 3)
+
+
+@pytest.mark.trio
+async def test_spsc_ring_wakes_waiting_consumer():
+    ring = SpscRing[int](8)
+    received = []
+
+    async def consume():
+        while len(received) < 4:
+            received.extend(await ring.receive_batch())
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(consume)
+        await trio.testing.wait_all_tasks_blocked()
+
+        ring.push(1)
+        ring.push(2)
+        await trio.testing.wait_all_tasks_blocked()
+        ring.push(3)
+        ring.push(4)
+
+    assert received == [1, 2, 3, 4]
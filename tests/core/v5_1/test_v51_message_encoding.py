@@ -0,0 +1,38 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from ddht.base_message import BaseMessage
+from ddht.v5_1.messages import (
+    V51_MESSAGE_CLASSES,
+    PingMessage,
+    PongMessage,
+    v51_registry,
+)
+
+request_id_st = st.binary(min_size=0, max_size=64)
+enr_seq_st = st.integers(min_value=0, max_value=2 ** 64 - 1)
+
+
+@given(request_id=request_id_st, enr_seq=enr_seq_st)
+def test_ping_message_cached_encoding(request_id, enr_seq):
+    message = PingMessage(request_id, enr_seq)
+
+    assert message.to_bytes() == BaseMessage.to_bytes(message)
+
+
+@given(
+    request_id=request_id_st,
+    enr_seq=enr_seq_st,
+    ip_address=st.binary(min_size=4, max_size=4),
+    port=st.integers(min_value=0, max_value=65535),
+)
+def test_pong_message_cached_encoding(request_id, enr_seq, ip_address, port):
+    message = PongMessage(request_id, enr_seq, ip_address, port)
+
+    assert message.to_bytes() == BaseMessage.to_bytes(message)
+
+
+def test_v51_message_classes_match_registry():
+    assert V51_MESSAGE_CLASSES[0] is None
+    for message_type, message_class in v51_registry.items():
+        assert V51_MESSAGE_CLASSES[message_type] is message_class